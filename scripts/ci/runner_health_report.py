@@ -8,14 +8,31 @@ human-readable summary and optional JSON artifact.
 from __future__ import annotations
 
 import argparse
+import base64
+import concurrent.futures
+import contextlib
+import gzip
+import http.client
+import io
 import json
 import os
+import re
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
 from datetime import datetime, timezone
-from typing import Any
+from email.message import Message
+from typing import Any, Callable, NamedTuple
+
+try:  # Prefer orjson when installed; fall back to the stdlib parser.
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - depends on the runner image
+    from json import loads as json_loads
 
 
 def parse_args() -> argparse.Namespace:
@@ -72,6 +89,11 @@ def parse_args() -> argparse.Namespace:
         default="",
         help="Optional path to write structured JSON report.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk ETag cache used for conditional API requests.",
+    )
     parser.add_argument(
         "--fail-on-threshold",
         action="store_true",
@@ -80,42 +102,366 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+LINK_LAST_PAGE_RE = re.compile(r"[?&]page=(\d+)[^>]*>;\s*rel=\"last\"")
+MAX_PAGE_WORKERS = 8
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = frozenset({301, 302, 307, 308})
+
+
+ETAG_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+def default_etag_cache_path() -> str:
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "zeroclaw_runner_health", "etags.json")
+
+
+def is_valid_etag_entry(entry: Any) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("etag"), str)
+        and isinstance(entry.get("link", ""), str)
+        and isinstance(entry.get("payload"), dict)
+        and isinstance(entry.get("used_at", 0), (int, float))
+    )
+
+
+def load_etag_cache(path: str) -> dict[str, dict[str, Any]]:
+    """Read the ETag cache, silently dropping anything malformed."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            loaded = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(loaded, dict):
+        return {}
+    return {url: entry for url, entry in loaded.items() if is_valid_etag_entry(entry)}
+
+
 class GitHubApi:
-    def __init__(self, api_url: str, token: str | None) -> None:
+    """Minimal GitHub REST client backed by a shared pool of kept-alive connections.
+
+    A request checks out an idle connection (or opens one) and returns it to
+    the pool once the response body has been read, so parallel page fetches
+    reuse the sockets earlier requests opened instead of each paying a fresh
+    TCP+TLS handshake.
+    When `etag_cache_path` is set, responses are revalidated with
+    If-None-Match so unchanged pages come back as bodiless 304s, which GitHub
+    does not count against the rate limit.
+    """
+
+    def __init__(self, api_url: str, token: str | None, etag_cache_path: str | None = None) -> None:
         self.api_url = api_url.rstrip("/")
         self.token = token
-
-    def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        self._endpoint = urllib.parse.urlsplit(self.api_url)
+        self._headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "zeroclaw-runner-health-report",
+            # Runner and workflow-run JSON is highly repetitive and compresses well.
+            "Accept-Encoding": "gzip",
+        }
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
+        # Mirror urllib's ProxyHandler: honor *_proxy/no_proxy, tunnel HTTPS
+        # through CONNECT, and send plain HTTP requests in absolute form.
+        self._proxy: urllib.parse.SplitResult | None = None
+        self._proxy_headers: dict[str, str] = {}
+        proxy = urllib.request.getproxies().get(self._endpoint.scheme)
+        if proxy and not urllib.request.proxy_bypass(self._endpoint.netloc):
+            self._proxy = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            if self._proxy.username is not None:
+                user = urllib.parse.unquote(self._proxy.username)
+                password = urllib.parse.unquote(self._proxy.password or "")
+                credentials = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+                self._proxy_headers["Proxy-Authorization"] = f"Basic {credentials}"
+            if self._endpoint.scheme != "https":
+                self._headers.update(self._proxy_headers)
+        self._idle: list[http.client.HTTPConnection] = []
+        self._connections: list[http.client.HTTPConnection] = []
+        self._connections_lock = threading.Lock()
+        self._etag_cache_path = etag_cache_path
+        self._etag_cache = load_etag_cache(etag_cache_path) if etag_cache_path else {}
+        self._etag_cache_used: dict[str, dict[str, Any]] = {}
+        self._etag_cache_lock = threading.Lock()
+
+    def _open_connection(self) -> http.client.HTTPConnection:
+        endpoint = self._endpoint
+        conn_cls = http.client.HTTPSConnection if endpoint.scheme == "https" else http.client.HTTPConnection
+        if self._proxy is None:
+            conn = conn_cls(endpoint.hostname, endpoint.port, timeout=30)
+        else:
+            conn = conn_cls(self._proxy.hostname, self._proxy.port, timeout=30)
+            if endpoint.scheme == "https":
+                conn.set_tunnel(endpoint.hostname, endpoint.port, headers=self._proxy_headers)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        with self._connections_lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open_connection()
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._connections_lock:
+            self._idle.append(conn)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._idle.clear()
+        self._save_etag_cache()
+
+    def _save_etag_cache(self) -> None:
+        if not self._etag_cache_path or not self._etag_cache_used:
+            return
+        # Merge into whatever is on disk now so runs for other repositories or
+        # API URLs keep their entries; entries unused for a week are pruned so
+        # the file cannot grow without bound as page counts change.
+        merged = load_etag_cache(self._etag_cache_path)
+        merged.update(self._etag_cache_used)
+        cutoff = time.time() - ETAG_CACHE_MAX_AGE_SECONDS
+        merged = {url: entry for url, entry in merged.items() if entry.get("used_at", 0) >= cutoff}
+        # The payloads can carry branch names and run titles of private
+        # repositories; mkstemp creates the file 0600 and gives concurrent
+        # runs distinct temporary names.
+        cache_dir = os.path.dirname(self._etag_cache_path) or "."
+        tmp_path = ""
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".etags-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(merged, handle)
+            os.replace(tmp_path, self._etag_cache_path)
+        except OSError as exc:
+            if tmp_path:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            print(f"warning: could not write ETag cache: {exc}", file=sys.stderr)
+
+    def _request_target(self, url: str) -> str:
+        if self._proxy is not None and self._endpoint.scheme != "https":
+            return url
+        parts = urllib.parse.urlsplit(url)
+        return urllib.parse.urlunsplit(("", "", parts.path, parts.query, ""))
+
+    def _send(self, target: str, headers: dict[str, str]) -> tuple[http.client.HTTPResponse, bytes]:
+        # An idle socket may have been closed by the server while it sat in the
+        # pool; retry once on a freshly opened connection before giving up.
+        for attempt in range(2):
+            conn = self._open_connection() if attempt else self._checkout()
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                break
+            except (ConnectionError, http.client.BadStatusLine):
+                conn.close()
+                if attempt:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return resp, body
+
+    def _request(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> tuple[dict[str, Any], Message]:
         query = urllib.parse.urlencode(params or {}, doseq=True)
-        url = f"{self.api_url}{path}"
         if query:
-            url = f"{url}?{query}"
-        req = urllib.request.Request(url)
-        req.add_header("Accept", "application/vnd.github+json")
-        req.add_header("X-GitHub-Api-Version", "2022-11-28")
-        if self.token:
-            req.add_header("Authorization", f"Bearer {self.token}")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-
-    def paginate(self, path: str, key: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
-        page = 1
-        results: list[dict[str, Any]] = []
-        while True:
-            query = {"per_page": 100, "page": page}
+            path = f"{path}?{query}"
+        url = f"{self.api_url}{path}"
+        target = self._request_target(url)
+        headers = self._headers
+        cached = self._etag_cache.get(url)
+        if cached:
+            headers = {**headers, "If-None-Match": cached["etag"]}
+        request_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            resp, body = self._send(target, headers)
+            if resp.status not in REDIRECT_STATUSES:
+                break
+            # GitHub answers renamed or transferred repositories with a
+            # redirect; follow it on the same host so kept-alive connections
+            # (and the Authorization header) stay with the configured API.
+            location = urllib.parse.urlsplit(urllib.parse.urljoin(request_url, resp.headers.get("Location", "")))
+            if (location.scheme, location.netloc) != (self._endpoint.scheme, self._endpoint.netloc):
+                break
+            request_url = urllib.parse.urlunsplit(location._replace(fragment=""))
+            target = self._request_target(request_url)
+        if body and resp.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        if resp.status == 304 and cached:
+            with self._etag_cache_lock:
+                self._etag_cache_used[url] = {**cached, "used_at": time.time()}
+            cached_headers = Message()
+            if cached.get("link"):
+                cached_headers["Link"] = cached["link"]
+            return cached["payload"], cached_headers
+        if resp.status >= 300:
+            raise urllib.error.HTTPError(request_url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+        payload = json_loads(body)
+        etag = resp.headers.get("ETag")
+        if self._etag_cache_path and etag and isinstance(payload, dict):
+            with self._etag_cache_lock:
+                self._etag_cache_used[url] = {
+                    "etag": etag,
+                    "link": resp.headers.get("Link", ""),
+                    "payload": payload,
+                    "used_at": time.time(),
+                }
+        return payload, resp.headers
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        return self._request(path, params)[0]
+
+    def get_first(
+        self,
+        path: str,
+        key: str,
+        params: dict[str, Any] | None = None,
+        per_page: int = 10,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Fetch only the first page, returning (total_count, items)."""
+        query: dict[str, Any] = {"per_page": per_page, "page": 1}
+        if params:
+            query.update(params)
+        payload = self.get(path, query)
+        items = payload.get(key, [])
+        return int(payload.get("total_count", len(items))), items
+
+    def fetch_count(self, path: str, key: str, params: dict[str, Any] | None = None) -> int:
+        """Return total_count for a listing using a minimal one-item page."""
+        return self.get_first(path, key, params, per_page=1)[0]
+
+    def paginate(
+        self,
+        path: str,
+        key: str,
+        params: dict[str, Any] | None = None,
+        keep: Callable[[dict[str, Any]], bool] | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Any]:
+        """Fetch every page of `key`, retaining only items accepted by `keep`.
+
+        When `fields` is given, retained items are reduced to tuples of those
+        values (in `fields` order), keeping the returned list compact. This does
+        not bound peak memory: with the ETag cache enabled, `_request` holds
+        each raw page payload until `close()` so it can be persisted.
+        """
+
+        def page_query(page: int) -> dict[str, Any]:
+            query: dict[str, Any] = {"per_page": 100, "page": page}
             if params:
                 query.update(params)
-            payload = self.get(path, query)
-            items = payload.get(key, [])
+            return query
+
+        def select(items: list[dict[str, Any]]) -> list[Any]:
+            if keep is not None:
+                items = [item for item in items if keep(item)]
+            if fields is not None:
+                return [tuple(item.get(field) for field in fields) for item in items]
+            return items
+
+        payload, headers = self._request(path, page_query(1))
+        first_page = payload.get(key, [])
+        results: list[Any] = select(first_page)
+        if len(first_page) < 100:
+            return results
+
+        # GitHub advertises the final page in the Link header; when present,
+        # fetch the remaining pages in parallel instead of one round-trip each.
+        # Workers draw on the client's shared connection pool, so they reuse
+        # the sockets that page 1 and the other listings already opened.
+        match = LINK_LAST_PAGE_RE.search(headers.get("Link", ""))
+        if match:
+            last_page = int(match.group(1))
+            if last_page < 2:
+                return results
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(MAX_PAGE_WORKERS, last_page - 1)
+            ) as pool:
+                pages = pool.map(
+                    lambda page: self.get(path, page_query(page)).get(key, []),
+                    range(2, last_page + 1),
+                )
+                for items in pages:
+                    results.extend(select(items))
+            return results
+
+        page = 2
+        while True:
+            items = self.get(path, page_query(page)).get(key, [])
             if not items:
                 break
-            results.extend(items)
+            results.extend(select(items))
             if len(items) < 100:
                 break
             page += 1
         return results
 
 
+class RunnerStats(NamedTuple):
+    online: int
+    available: int
+    queued: int
+    busy_ratio: float
+    offline: int
+
+
+# (alert id, severity, breach predicate, message builder). Messages are only
+# formatted for thresholds that actually fire.
+THRESHOLDS: list[
+    tuple[
+        str,
+        str,
+        Callable[[RunnerStats, argparse.Namespace], bool],
+        Callable[[RunnerStats, argparse.Namespace], str],
+    ]
+] = [
+    (
+        "low-online-runners",
+        "critical",
+        lambda s, a: s.online < a.min_online,
+        lambda s, a: f"Online runners below threshold: {s.online} < {a.min_online}",
+    ),
+    (
+        "low-available-runners",
+        "critical",
+        lambda s, a: s.available < a.min_available,
+        lambda s, a: f"Available runners below threshold: {s.available} < {a.min_available}",
+    ),
+    (
+        "queue-pressure",
+        "critical",
+        lambda s, a: s.queued > a.max_queued_runs,
+        lambda s, a: f"Queued runs above threshold: {s.queued} > {a.max_queued_runs}",
+    ),
+    (
+        "high-busy-ratio",
+        "warning",
+        lambda s, a: s.busy_ratio > a.max_busy_ratio,
+        lambda s, a: f"Busy ratio above threshold: {s.busy_ratio:.2%} > {a.max_busy_ratio:.2%}",
+    ),
+    (
+        "offline-runners",
+        "warning",
+        lambda s, a: s.offline > 0,
+        lambda s, a: f"{s.offline} runners are offline in the target label pool.",
+    ),
+]
+
+
 def split_repo(repo: str) -> tuple[str, str]:
     parts = repo.split("/", 1)
     if len(parts) != 2 or not parts[0] or not parts[1]:
@@ -124,109 +470,98 @@ def split_repo(repo: str) -> tuple[str, str]:
 
 
 def normalize_labels(labels: list[str]) -> list[str]:
-    out: list[str] = []
-    seen: set[str] = set()
-    for value in labels:
-        item = value.strip()
-        if not item:
-            continue
-        if item in seen:
-            continue
-        out.append(item)
-        seen.add(item)
-    return out
+    # dict.fromkeys dedupes while preserving first-seen order.
+    return list(dict.fromkeys(item for item in (value.strip() for value in labels) if item))
+
+
+def _gh_cli_token() -> str:
+    try:
+        return subprocess.check_output(
+            ["gh", "auth", "token"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except Exception:
+        return ""
+
+
+def resolve_token(explicit: str) -> str:
+    return explicit or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or _gh_cli_token()
 
 
 def collect_report(args: argparse.Namespace) -> dict[str, Any]:
     owner, repo = split_repo(args.repo)
     required_labels = normalize_labels(args.require_label)
-    token = args.token or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
-    if not token:
-        try:
-            token = subprocess.check_output(
-                ["gh", "auth", "token"],
-                text=True,
-                stderr=subprocess.DEVNULL,
-            ).strip()
-        except Exception:
-            token = ""
-
-    api = GitHubApi(args.api_url, token)
-
-    runners = api.paginate(
-        f"/repos/{owner}/{repo}/actions/runners",
-        key="runners",
+    token = resolve_token(args.token)
+
+    api = GitHubApi(
+        args.api_url,
+        token,
+        etag_cache_path=None if args.no_cache else default_etag_cache_path(),
     )
 
-    matching_runners: list[dict[str, Any]] = []
-    for runner in runners:
-        names = {entry.get("name", "") for entry in runner.get("labels", [])}
-        if all(label in names for label in required_labels):
-            matching_runners.append(runner)
+    # The REST runners endpoint cannot filter by label, so drop non-matching
+    # runners page by page instead of holding the whole pool in memory.
+    required_set = frozenset(required_labels)
 
-    queued_runs = api.paginate(
-        f"/repos/{owner}/{repo}/actions/runs",
-        key="workflow_runs",
-        params={"status": "queued"},
-    )
-    in_progress_runs = api.paginate(
-        f"/repos/{owner}/{repo}/actions/runs",
-        key="workflow_runs",
-        params={"status": "in_progress"},
-    )
+    def has_required_labels(runner: dict[str, Any]) -> bool:
+        return required_set.issubset([entry.get("name", "") for entry in runner.get("labels", [])])
+
+    try:
+        # The three listings are independent and round-trip bound, so fetch them
+        # concurrently; socket reads release the GIL while waiting on the network.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+            runners_future = pool.submit(
+                api.paginate,
+                f"/repos/{owner}/{repo}/actions/runners",
+                key="runners",
+                keep=has_required_labels,
+                fields=("status", "busy"),
+            )
+            # Workflow runs only need total_count plus a few queued examples;
+            # in-progress runs are counted from a one-item page.
+            queued_future = pool.submit(
+                api.get_first,
+                f"/repos/{owner}/{repo}/actions/runs",
+                key="workflow_runs",
+                params={"status": "queued"},
+            )
+            in_progress_future = pool.submit(
+                api.fetch_count,
+                f"/repos/{owner}/{repo}/actions/runs",
+                key="workflow_runs",
+                params={"status": "in_progress"},
+            )
+            matching_runners = runners_future.result()
+            queued_count, queued_runs = queued_future.result()
+            in_progress_count = in_progress_future.result()
+    finally:
+        api.close()
 
     total = len(matching_runners)
-    online = sum(1 for runner in matching_runners if runner.get("status") == "online")
+    online = 0
+    online_busy = 0
+    for status, busy in matching_runners:
+        if status == "online":
+            online += 1
+            if busy:
+                online_busy += 1
     offline = total - online
-    online_busy = sum(
-        1
-        for runner in matching_runners
-        if runner.get("status") == "online" and bool(runner.get("busy"))
-    )
     available = online - online_busy
     busy_ratio = (online_busy / online) if online else 1.0
 
-    alerts: list[dict[str, Any]] = []
-    if online < args.min_online:
-        alerts.append(
-            {
-                "id": "low-online-runners",
-                "severity": "critical",
-                "message": f"Online runners below threshold: {online} < {args.min_online}",
-            }
-        )
-    if available < args.min_available:
-        alerts.append(
-            {
-                "id": "low-available-runners",
-                "severity": "critical",
-                "message": f"Available runners below threshold: {available} < {args.min_available}",
-            }
-        )
-    if len(queued_runs) > args.max_queued_runs:
-        alerts.append(
-            {
-                "id": "queue-pressure",
-                "severity": "critical",
-                "message": f"Queued runs above threshold: {len(queued_runs)} > {args.max_queued_runs}",
-            }
-        )
-    if busy_ratio > args.max_busy_ratio:
-        alerts.append(
-            {
-                "id": "high-busy-ratio",
-                "severity": "warning",
-                "message": f"Busy ratio above threshold: {busy_ratio:.2%} > {args.max_busy_ratio:.2%}",
-            }
-        )
-    if offline > 0:
-        alerts.append(
-            {
-                "id": "offline-runners",
-                "severity": "warning",
-                "message": f"{offline} runners are offline in the target label pool.",
-            }
-        )
+    stats = RunnerStats(
+        online=online,
+        available=available,
+        queued=queued_count,
+        busy_ratio=busy_ratio,
+        offline=offline,
+    )
+    alerts = [
+        {"id": alert_id, "severity": severity, "message": message(stats, args)}
+        for alert_id, severity, breached, message in THRESHOLDS
+        if breached(stats, args)
+    ]
 
     queued_examples = [
         {
@@ -253,8 +588,8 @@ def collect_report(args: argparse.Namespace) -> dict[str, Any]:
             "online_busy_ratio": round(busy_ratio, 4),
         },
         "workflow_run_counts": {
-            "queued": len(queued_runs),
-            "in_progress": len(in_progress_runs),
+            "queued": queued_count,
+            "in_progress": in_progress_count,
         },
         "thresholds": {
             "min_online": args.min_online,
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import contextlib
+import gzip
 import hashlib
 import http.server
 import json
@@ -15,7 +16,9 @@ import subprocess
 import tempfile
 import textwrap
 import threading
+import time
 import unittest
+import urllib.parse
 from pathlib import Path
 
 
@@ -84,6 +87,73 @@ def local_http_server() -> tuple[str, int]:
         thread.join(timeout=2)
 
 
+class _FakeGitHubApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        # One handler instance serves one TCP connection (and every
+        # kept-alive request on it).
+        self.server.connections.append(self.client_address)  # type: ignore[attr-defined]
+        super().setup()
+
+    def do_GET(self) -> None:  # noqa: N802
+        parsed = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        self.server.requests.append((parsed.path, query))  # type: ignore[attr-defined]
+        status, headers, payload = self.server.respond(parsed.path, query, self.headers)  # type: ignore[attr-defined]
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_after_response:  # type: ignore[attr-defined]
+            # Close the socket without announcing it, like an idle keep-alive
+            # timeout on the server side.
+            self.close_connection = True
+
+    def do_CONNECT(self) -> None:  # noqa: N802
+        # Act as a forward proxy just far enough to record the tunnel request.
+        self.server.requests.append(  # type: ignore[attr-defined]
+            ("CONNECT", {"target": self.path, "proxy_authorization": self.headers.get("Proxy-Authorization", "")})
+        )
+        self.send_response(200)
+        self.end_headers()
+        self.close_connection = True
+
+    def log_message(self, fmt: str, *args: object) -> None:  # pragma: no cover
+        return
+
+
+@contextlib.contextmanager
+def fake_github_api(respond, *, drop_after_response: bool = False, connections: list | None = None):
+    """Serve `respond(path, query, headers) -> (status, headers, payload)` over local HTTP."""
+
+    class _ThreadedServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+        allow_reuse_address = True
+        daemon_threads = True
+
+    server = _ThreadedServer(("127.0.0.1", 0), _FakeGitHubApiHandler)
+    server.respond = respond  # type: ignore[attr-defined]
+    server.requests = []  # type: ignore[attr-defined]
+    server.drop_after_response = drop_after_response  # type: ignore[attr-defined]
+    server.connections = connections if connections is not None else []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        yield f"http://{host}:{port}", server.requests  # type: ignore[attr-defined]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=2)
+
+
 class CiScriptsBehaviorTest(unittest.TestCase):
     maxDiff = None
 
@@ -4004,6 +4074,488 @@ class CiScriptsBehaviorTest(unittest.TestCase):
         self.assertEqual(proc.returncode, 2)
         self.assertIn("requires authentication token", proc.stderr.lower())
 
+    def test_runner_health_report_counts_matching_runners_and_queue(self) -> None:
+        runners = [
+            {"name": "r1", "status": "online", "busy": True, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]},
+            {"name": "r2", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]},
+            {"name": "r3", "status": "offline", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]},
+            {"name": "r4", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}]},
+        ]
+        queued = [{"id": 100 + i, "name": "CI Run", "event": "push"} for i in range(12)]
+        in_progress = [{"id": 200, "name": "CI Run", "event": "push"}]
+
+        def respond(path: str, query: dict[str, str], _headers: object):
+            if path == "/repos/acme/widgets/actions/runners":
+                return 200, {}, {"total_count": len(runners), "runners": runners}
+            if path == "/repos/acme/widgets/actions/runs":
+                runs = queued if query.get("status") == "queued" else in_progress
+                per_page = int(query.get("per_page", "30"))
+                return 200, {}, {"total_count": len(runs), "workflow_runs": runs[:per_page]}
+            return 404, {}, {"message": "Not Found"}
+
+        output_json = self.tmp / "runner-health.json"
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        with fake_github_api(respond) as (api_url, requests):
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    api_url,
+                    "--max-queued-runs",
+                    "10",
+                    "--output-json",
+                    str(output_json),
+                    "--fail-on-threshold",
+                ],
+                env=env,
+            )
+        self.assertEqual(proc.returncode, 1, msg=proc.stderr)
+
+        report = json.loads(output_json.read_text(encoding="utf-8"))
+        self.assertEqual(
+            report["runner_counts"],
+            {
+                "total_matching": 3,
+                "online": 2,
+                "offline": 1,
+                "online_busy": 1,
+                "online_available": 1,
+                "online_busy_ratio": 0.5,
+            },
+        )
+        self.assertEqual(report["workflow_run_counts"], {"queued": 12, "in_progress": 1})
+        self.assertEqual(len(report["queued_run_examples"]), 10)
+        alert_ids = [alert["id"] for alert in report["alerts"]]
+        self.assertEqual(alert_ids, ["low-online-runners", "queue-pressure", "offline-runners"])
+        run_requests = {
+            query["status"]: query["per_page"] for path, query in requests if path.endswith("/actions/runs")
+        }
+        self.assertEqual(run_requests, {"queued": "10", "in_progress": "1"})
+
+    def test_runner_health_report_fetches_link_advertised_pages(self) -> None:
+        runners = [
+            {
+                "name": f"r{i}",
+                "status": "online",
+                "busy": i % 2 == 0,
+                "labels": [{"name": "self-hosted"}, {"name": "aws-india"}],
+            }
+            for i in range(250)
+        ]
+
+        def respond(path: str, query: dict[str, str], _headers: object):
+            if path == "/repos/acme/widgets/actions/runners":
+                page = int(query.get("page", "1"))
+                per_page = int(query.get("per_page", "30"))
+                items = runners[(page - 1) * per_page : page * per_page]
+                last = (len(runners) + per_page - 1) // per_page
+                link = (
+                    f'<{path}?per_page={per_page}&page={page + 1}>; rel="next", '
+                    f'<{path}?per_page={per_page}&page={last}>; rel="last"'
+                )
+                return 200, {"Link": link}, {"total_count": len(runners), "runners": items}
+            return 200, {}, {"total_count": 0, "workflow_runs": []}
+
+        output_json = self.tmp / "runner-health-paged.json"
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        with fake_github_api(respond) as (api_url, requests):
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    api_url,
+                    "--output-json",
+                    str(output_json),
+                ],
+                env=env,
+            )
+        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+
+        report = json.loads(output_json.read_text(encoding="utf-8"))
+        self.assertEqual(report["runner_counts"]["total_matching"], 250)
+        self.assertEqual(report["runner_counts"]["online_busy"], 125)
+        runner_pages = sorted(
+            int(query["page"]) for path, query in requests if path.endswith("/actions/runners")
+        )
+        self.assertEqual(runner_pages, [1, 2, 3])
+
+    def test_runner_health_report_revalidates_cached_pages_with_etags(self) -> None:
+        runners = [
+            {"name": "r1", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]},
+        ]
+        not_modified: list[str] = []
+
+        def respond(path: str, query: dict[str, str], headers):
+            payload = {"total_count": 1, "runners": runners}
+            if path.endswith("/actions/runs"):
+                payload = {"total_count": 0, "workflow_runs": []}
+            etag = f'"{path}-{query.get("status", "")}"'
+            if headers.get("If-None-Match") == etag:
+                not_modified.append(path)
+                return 304, {"ETag": etag}, None
+            return 200, {"ETag": etag}, payload
+
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        reports = []
+        with fake_github_api(respond) as (api_url, requests):
+            for attempt in range(2):
+                output_json = self.tmp / f"runner-health-etag-{attempt}.json"
+                proc = run_cmd(
+                    [
+                        "python3",
+                        self._script("runner_health_report.py"),
+                        "--repo",
+                        "acme/widgets",
+                        "--api-url",
+                        api_url,
+                        "--min-online",
+                        "1",
+                        "--output-json",
+                        str(output_json),
+                    ],
+                    env=env,
+                )
+                self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+                reports.append(json.loads(output_json.read_text(encoding="utf-8")))
+
+        self.assertTrue((self.tmp / "cache" / "zeroclaw_runner_health" / "etags.json").is_file())
+        self.assertEqual(reports[0]["runner_counts"], reports[1]["runner_counts"])
+        self.assertEqual(reports[1]["runner_counts"]["online"], 1)
+        self.assertEqual(len(requests), 6)
+        self.assertEqual(len(not_modified), 3)
+
+    def test_runner_health_report_follows_same_host_repository_redirects(self) -> None:
+        runners = [
+            {"name": "r1", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]},
+        ]
+
+        def respond(path: str, query: dict[str, str], headers):
+            if path.startswith("/repos/old/widgets/"):
+                moved = path.replace("/repos/old/widgets/", "/repositories/42/", 1)
+                location = f"http://{headers['Host']}{moved}?{urllib.parse.urlencode(query)}"
+                return 301, {"Location": location}, {"message": "Moved Permanently"}
+            if path == "/repositories/42/actions/runners":
+                return 200, {}, {"total_count": 1, "runners": runners}
+            if path == "/repositories/42/actions/runs":
+                return 200, {}, {"total_count": 4, "workflow_runs": [{"id": 1}]}
+            return 404, {}, {"message": "Not Found"}
+
+        output_json = self.tmp / "runner-health-redirect.json"
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        with fake_github_api(respond) as (api_url, requests):
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "old/widgets",
+                    "--api-url",
+                    api_url,
+                    "--min-online",
+                    "1",
+                    "--output-json",
+                    str(output_json),
+                ],
+                env=env,
+            )
+        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+
+        report = json.loads(output_json.read_text(encoding="utf-8"))
+        self.assertEqual(report["runner_counts"]["online"], 1)
+        self.assertEqual(report["workflow_run_counts"], {"queued": 4, "in_progress": 4})
+        self.assertEqual(sum(1 for path, _ in requests if path.startswith("/repositories/42/")), 3)
+
+    def _proxy_env(self, proxy_url: str) -> dict[str, str]:
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key.lower() not in {"http_proxy", "https_proxy", "all_proxy", "no_proxy"}
+        }
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        env["http_proxy"] = proxy_url
+        env["https_proxy"] = proxy_url
+        return env
+
+    def test_runner_health_report_sends_plain_http_through_authenticated_proxy(self) -> None:
+        seen: list[tuple[str, str]] = []
+
+        def respond(path: str, query: dict[str, str], headers):
+            seen.append((headers.get("Host", ""), headers.get("Proxy-Authorization", "")))
+            if path.endswith("/actions/runners"):
+                return 200, {}, {"total_count": 0, "runners": []}
+            return 200, {}, {"total_count": 0, "workflow_runs": []}
+
+        with fake_github_api(respond) as (proxy_url, _requests):
+            proxy = urllib.parse.urlsplit(proxy_url)
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    "http://api.example.test",
+                    "--no-cache",
+                ],
+                env=self._proxy_env(f"http://ci%40bot:s3cret@{proxy.netloc}"),
+            )
+        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+        self.assertEqual(len(seen), 3)
+        # "ci@bot:s3cret", with the percent-encoded userinfo decoded.
+        expected = ("api.example.test", "Basic Y2lAYm90OnMzY3JldA==")
+        self.assertEqual(set(seen), {expected})
+
+    def test_runner_health_report_tunnels_https_through_authenticated_proxy(self) -> None:
+        with fake_github_api(lambda path, query, headers: (404, {}, None)) as (proxy_url, requests):
+            proxy = urllib.parse.urlsplit(proxy_url)
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    "https://api.example.test",
+                    "--no-cache",
+                ],
+                env=self._proxy_env(f"http://ci:s3cret@{proxy.netloc}"),
+            )
+        # The fake proxy closes the tunnel instead of speaking TLS.
+        self.assertEqual(proc.returncode, 2)
+        tunnels = [query for method, query in requests if method == "CONNECT"]
+        self.assertTrue(tunnels)
+        for tunnel in tunnels:
+            self.assertEqual(tunnel["target"], "api.example.test:443")
+            self.assertEqual(tunnel["proxy_authorization"], "Basic Y2k6czNjcmV0")
+
+    def test_runner_health_report_reconnects_after_server_closes_connection(self) -> None:
+        runners = [
+            {"name": f"r{i}", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]}
+            for i in range(250)
+        ]
+
+        def make_respond(extra_headers: dict[str, str]):
+            # No Link header, so runner pages 2..3 are fetched sequentially on
+            # the same thread (and connection) that fetched page 1.
+            def respond(path: str, query: dict[str, str], headers):
+                if path.endswith("/actions/runners"):
+                    page = int(query.get("page", "1"))
+                    items = runners[(page - 1) * 100 : page * 100]
+                    return 200, dict(extra_headers), {"total_count": len(runners), "runners": items}
+                return 200, dict(extra_headers), {"total_count": 0, "workflow_runs": []}
+
+            return respond
+
+        cases = {
+            "silent close after keep-alive response": ({}, True),
+            "Connection: close response": ({"Connection": "close"}, False),
+        }
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        for name, (extra_headers, drop_after_response) in cases.items():
+            with self.subTest(name), fake_github_api(
+                make_respond(extra_headers), drop_after_response=drop_after_response
+            ) as (api_url, requests):
+                output_json = self.tmp / "runner-health-reconnect.json"
+                proc = run_cmd(
+                    [
+                        "python3",
+                        self._script("runner_health_report.py"),
+                        "--repo",
+                        "acme/widgets",
+                        "--api-url",
+                        api_url,
+                        "--no-cache",
+                        "--output-json",
+                        str(output_json),
+                    ],
+                    env=env,
+                )
+                self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+                report = json.loads(output_json.read_text(encoding="utf-8"))
+                self.assertEqual(report["runner_counts"]["total_matching"], 250)
+                runner_pages = [int(query["page"]) for path, query in requests if path.endswith("/actions/runners")]
+                self.assertEqual(runner_pages, [1, 2, 3])
+
+    def test_runner_health_report_tolerates_and_merges_existing_etag_cache(self) -> None:
+        def respond(path: str, query: dict[str, str], headers):
+            if path.endswith("/actions/runners"):
+                return 200, {"ETag": '"runners"'}, {"total_count": 0, "runners": []}
+            return 200, {"ETag": '"runs"'}, {"total_count": 0, "workflow_runs": []}
+
+        cache_file = self.tmp / "cache" / "zeroclaw_runner_health" / "etags.json"
+        cache_file.parent.mkdir(parents=True)
+        other_repo_url = "https://api.example.test/repos/acme/other/actions/runners?per_page=100&page=1"
+        other_entry = {"etag": '"other"', "link": "", "payload": {"runners": []}, "used_at": time.time()}
+        stale_url = "https://api.example.test/repos/acme/stale/actions/runners?per_page=100&page=1"
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        with fake_github_api(respond) as (api_url, _requests):
+            runners_url = f"{api_url}/repos/acme/widgets/actions/runners?per_page=100&page=1"
+            cache_file.write_text(
+                json.dumps(
+                    {
+                        runners_url: "stale",
+                        f"{api_url}/repos/acme/widgets/actions/runs?per_page=10&page=1&status=queued": {
+                            "etag": '"runs"',
+                            "payload": ["not", "a", "dict"],
+                        },
+                        other_repo_url: other_entry,
+                        stale_url: {**other_entry, "used_at": 0},
+                    }
+                ),
+                encoding="utf-8",
+            )
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    api_url,
+                ],
+                env=env,
+            )
+        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+
+        self.assertEqual(cache_file.stat().st_mode & 0o777, 0o600)
+        self.assertEqual(sorted(p.name for p in cache_file.parent.iterdir()), ["etags.json"])
+        cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        self.assertEqual(cache[other_repo_url], other_entry)
+        self.assertNotIn(stale_url, cache)
+        self.assertEqual(cache[runners_url]["etag"], '"runners"')
+        self.assertEqual(len(cache), 4)
+
+    def _paged_runners_with_etags(self, conditional: list[tuple[str, int]]):
+        runners = [
+            {"name": f"r{i}", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]}
+            for i in range(250)
+        ]
+
+        def respond(path: str, query: dict[str, str], headers):
+            page = int(query.get("page", "1"))
+            etag = f'"{path}-{query.get("status", "")}-{page}"'
+            if "If-None-Match" in headers:
+                conditional.append((path, page))
+                if headers["If-None-Match"] == etag:
+                    return 304, {"ETag": etag}, None
+            if path.endswith("/actions/runners"):
+                link = (
+                    f'<{path}?per_page=100&page={page + 1}>; rel="next", '
+                    f'<{path}?per_page=100&page=3>; rel="last"'
+                )
+                items = runners[(page - 1) * 100 : page * 100]
+                return 200, {"ETag": etag, "Link": link}, {"total_count": len(runners), "runners": items}
+            return 200, {"ETag": etag}, {"total_count": 0, "workflow_runs": []}
+
+        return respond
+
+    def _run_runner_health_twice(self, respond, *extra_args: str) -> tuple[list[dict], list[tuple[str, dict[str, str]]]]:
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        env["XDG_CACHE_HOME"] = str(self.tmp / "cache")
+        reports = []
+        with fake_github_api(respond) as (api_url, requests):
+            for attempt in range(2):
+                output_json = self.tmp / f"runner-health-twice-{attempt}.json"
+                proc = run_cmd(
+                    [
+                        "python3",
+                        self._script("runner_health_report.py"),
+                        "--repo",
+                        "acme/widgets",
+                        "--api-url",
+                        api_url,
+                        "--output-json",
+                        str(output_json),
+                        *extra_args,
+                    ],
+                    env=env,
+                )
+                self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+                reports.append(json.loads(output_json.read_text(encoding="utf-8")))
+        return reports, requests
+
+    def test_runner_health_report_no_cache_skips_conditional_requests(self) -> None:
+        conditional: list[tuple[str, int]] = []
+        reports, requests = self._run_runner_health_twice(self._paged_runners_with_etags(conditional), "--no-cache")
+
+        self.assertEqual(conditional, [])
+        self.assertEqual(len(requests), 10)
+        self.assertEqual(reports[1]["runner_counts"]["total_matching"], 250)
+        self.assertFalse((self.tmp / "cache").exists())
+
+    def test_runner_health_report_replays_cached_link_header_on_not_modified(self) -> None:
+        conditional: list[tuple[str, int]] = []
+        reports, requests = self._run_runner_health_twice(self._paged_runners_with_etags(conditional))
+
+        # The second run's first runners page is a bodiless 304; the cached Link
+        # header must still drive the parallel fetch of pages 2..3.
+        runner_pages = sorted(query["page"] for path, query in requests if path.endswith("/actions/runners"))
+        self.assertEqual(runner_pages, ["1", "1", "2", "2", "3", "3"])
+        self.assertEqual(
+            sorted(page for path, page in conditional if path.endswith("/actions/runners")),
+            [1, 2, 3],
+        )
+        self.assertEqual(reports[0]["runner_counts"], reports[1]["runner_counts"])
+        self.assertEqual(reports[1]["runner_counts"]["total_matching"], 250)
+
+    def test_runner_health_report_reuses_connections_across_parallel_pages(self) -> None:
+        runners = [
+            {"name": f"r{i}", "status": "online", "busy": False, "labels": [{"name": "self-hosted"}, {"name": "aws-india"}]}
+            for i in range(450)
+        ]
+
+        def respond(path: str, query: dict[str, str], headers):
+            if path.endswith("/actions/runners"):
+                page = int(query.get("page", "1"))
+                link = (
+                    f'<{path}?per_page=100&page={page + 1}>; rel="next", '
+                    f'<{path}?per_page=100&page=5>; rel="last"'
+                )
+                items = runners[(page - 1) * 100 : page * 100]
+                return 200, {"Link": link}, {"total_count": len(runners), "runners": items}
+            return 200, {}, {"total_count": 0, "workflow_runs": []}
+
+        connections: list[tuple[str, int]] = []
+        env = dict(os.environ)
+        env["GH_TOKEN"] = "test-token"
+        with fake_github_api(respond, connections=connections) as (api_url, requests):
+            proc = run_cmd(
+                [
+                    "python3",
+                    self._script("runner_health_report.py"),
+                    "--repo",
+                    "acme/widgets",
+                    "--api-url",
+                    api_url,
+                    "--no-cache",
+                ],
+                env=env,
+            )
+        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+        self.assertEqual(len(requests), 7)
+        # Page 1's connection is back in the pool before pages 2..5 fan out,
+        # so at most 3 + 3 sockets are opened for 7 requests.
+        self.assertLess(len(connections), len(requests))
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main(verbosity=2)